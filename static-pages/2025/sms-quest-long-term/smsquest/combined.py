@@ -3,21 +3,8 @@ from pyscript import window
 import re
 import sys
 import inspect
-try:
-    import readline  # noqa: adds readline semantics to input()
-except ImportError:
-    pass
-import textwrap
+import itertools
 import random
-from copy import deepcopy
-try:
-    from shutil import get_terminal_size
-except ImportError:
-    try:
-        from backports.shutil_get_terminal_size import get_terminal_size
-    except ImportError:
-        def get_terminal_size(fallback=(80, 24)):
-            return fallback
 
 __version__ = '1.2.1'
 __all__ = (
@@ -27,6 +14,7 @@ __all__ = (
     'AdvItem',
     'Bag',
     'say',
+    'refresh_terminal_width',
     'set_context',
     'get_context',
 )
@@ -34,7 +22,7 @@ __all__ = (
 
 # --- App Classes ---
 
-from typing import Optional, Callable
+from typing import Optional, Callable, Final
 from enum import Enum
 
 
@@ -42,6 +30,7 @@ from enum import Enum
 import os, time
 from enum import Enum
 import json
+from functools import cache, wraps
 
 
 
@@ -140,6 +129,8 @@ class InvalidDirection(Exception):
 
 class Placeholder:
     """Match a word in a command string."""
+    __slots__ = ('name',)
+
     def __init__(self, name):
         self.name = name
 
@@ -152,6 +143,14 @@ class AdvRoom:
 
     _directions = {}
 
+    #: The sorted list of exits, computed by exits() and reset whenever an
+    #: exit of the room changes.
+    _exits_cache = None
+
+    #: The exits mapped to the rooms they lead to, computed by exit_map()
+    #: and reset together with _exits_cache.
+    _exit_map_cache = None
+
     @staticmethod
     def add_direction(forward, reverse):
         """Add a direction."""
@@ -172,10 +171,11 @@ class AdvRoom:
     def __init__(self, description):
         self.description = description.strip()
 
-        # Copy class Bags to instance variables
+        # Copy class Bags to instance variables. The copies are shallow:
+        # Items are shared between rooms, only the Bags are per-instance.
         for k, v in vars(type(self)).items():
             if isinstance(v, Bag):
-                setattr(self, k, deepcopy(v))
+                setattr(self, k, Bag(v))
 
     def __str__(self):
         return self.description
@@ -191,8 +191,31 @@ class AdvRoom:
         return getattr(self, direction, None)
 
     def exits(self):
-        """Get a list of directions to exit the room."""
-        return sorted(d for d in self._directions if getattr(self, d))
+        """Get a list of directions to exit the room.
+
+        The list is cached until the exits change and must not be modified.
+
+        """
+        if self._exits_cache is None:
+            self._exits_cache = sorted(self.exit_map())
+        return self._exits_cache
+
+    def exit_map(self):
+        """Get a dict mapping each direction with an exit to its room.
+
+        The dict is cached until the exits change and must not be modified.
+
+        """
+        if self._exit_map_cache is None:
+            self._exit_map_cache = {
+                d: getattr(self, d) for d in self._directions if getattr(self, d)
+            }
+        return self._exit_map_cache
+
+    def _reset_exits(self):
+        """Discard the cached exits after a direction attribute changes."""
+        object.__setattr__(self, '_exits_cache', None)
+        object.__setattr__(self, '_exit_map_cache', None)
 
     def __setattr__(self, name, value):
         if isinstance(value, AdvRoom):
@@ -205,8 +228,12 @@ class AdvRoom:
             reverse = self._directions[name]
             object.__setattr__(self, name, value)
             object.__setattr__(value, reverse, self)
+            self._reset_exits()
+            value._reset_exits()
         else:
             object.__setattr__(self, name, value)
+            if name in self._directions:
+                self._reset_exits()
 
 
 AdvRoom.add_direction('north', 'south')
@@ -216,12 +243,15 @@ AdvRoom.add_direction('east', 'west')
 class AdvItem:
     """A generic item object that can be referred to by a number of names."""
 
+    __slots__ = ('name', 'aliases', '_alias_set')
+
     def __init__(self, name, *aliases):
         self.name = name
-        self.aliases = tuple(
-            label.lower()
-            for label in (name,) + aliases
-        )
+        labels = (name,) + aliases
+        if not all(map(str.islower, labels)):
+            labels = tuple(map(str.lower, labels))
+        self.aliases = labels
+        self._alias_set = frozenset(self.aliases)
 
     def __repr__(self):
         return '%s(%s)' % (
@@ -241,16 +271,115 @@ class Bag(set):
     by name.
 
     """
+    __slots__ = ('_by_alias', '_list', '_names')
+
+    def __init__(self, items=()):
+        super().__init__()
+        #: Maps each lowercase alias to an Item in the bag that answers to it.
+        self._by_alias = {}
+        #: The Items in the bag as a list, so one can be picked at random.
+        self._list = []
+        #: The comma-separated names of the Items, built on first use.
+        self._names = None
+        self.update(items)
+
+    def _index(self, item):
+        """Add the aliases of item to the alias index."""
+        self._names = None
+        for alias in item.aliases:
+            self._by_alias.setdefault(alias, item)
+
+    def _unindex(self, item):
+        """Remove the aliases of item from the alias index.
+
+        Aliases that are shared with another Item still in the bag are
+        pointed at the earliest added of those Items instead.
+
+        """
+        self._names = None
+        for alias in item.aliases:
+            if self._by_alias.get(alias) is item:
+                del self._by_alias[alias]
+                for other in self._list:
+                    if alias in other._alias_set:
+                        self._by_alias[alias] = other
+                        break
+
+    def _reindex(self):
+        """Rebuild the alias index and item list from the contents."""
+        self._by_alias = {}
+        self._list = list(self)
+        self._names = None
+        for item in self._list:
+            self._index(item)
+
+    def add(self, item):
+        if not set.__contains__(self, item):
+            set.add(self, item)
+            self._list.append(item)
+            self._index(item)
+
+    def remove(self, item):
+        set.remove(self, item)
+        self._list.remove(item)
+        self._unindex(item)
+
+    def discard(self, item):
+        if set.__contains__(self, item):
+            self.remove(item)
+
+    def pop(self):
+        item = set.pop(self)
+        self._list.remove(item)
+        self._unindex(item)
+        return item
+
+    def clear(self):
+        set.clear(self)
+        self._by_alias.clear()
+        self._list.clear()
+        self._names = None
+
+    def update(self, *others):
+        for other in others:
+            for item in other:
+                self.add(item)
+
+    def difference_update(self, *others):
+        set.difference_update(self, *others)
+        self._reindex()
+
+    def intersection_update(self, *others):
+        set.intersection_update(self, *others)
+        self._reindex()
+
+    def symmetric_difference_update(self, other):
+        set.symmetric_difference_update(self, other)
+        self._reindex()
+
+    def __ior__(self, other):
+        self.update(other)
+        return self
+
+    def __isub__(self, other):
+        self.difference_update(other)
+        return self
+
+    def __iand__(self, other):
+        self.intersection_update(other)
+        return self
+
+    def __ixor__(self, other):
+        self.symmetric_difference_update(other)
+        return self
+
     def find(self, name):
         """Find an object in the bag by name, but do not remove it.
 
         Return None if the name does not match.
 
         """
-        for item in self:
-            if name.lower() in item.aliases:
-                return item
-        return None
+        return self._by_alias.get(name.lower())
 
     def __contains__(self, v):
         """Return True if an Item is present in the bag.
@@ -259,10 +388,17 @@ class Bag(set):
         identity.
 
         """
+        if set.__contains__(self, v):
+            return True
         if isinstance(v, str):
-            return bool(self.find(v))
-        else:
-            return set.__contains__(v)
+            return v.lower() in self._by_alias
+        return False
+
+    def names(self):
+        """Return the names of the Items in the bag, separated by commas."""
+        if self._names is None:
+            self._names = ', '.join(item.name for item in self._list)
+        return self._names
 
     def take(self, name):
         """Remove an Item from the bag if it is present.
@@ -283,12 +419,9 @@ class Bag(set):
         Return None if the bag is empty.
 
         """
-        if not self:
+        if not self._list:
             return None
-        which = random.randrange(len(self))
-        for index, obj in enumerate(self):
-            if index == which:
-                return obj
+        return random.choice(self._list)
 
     def take_random(self):
         """Remove an Item from the bag at random, and return it.
@@ -296,19 +429,42 @@ class Bag(set):
         Return None if the bag is empty.
 
         """
-        obj = self.get_random()
-        if obj is not None:
-            self.remove(obj)
+        items = self._list
+        if not items:
+            return None
+        # Pop by index so the remaining Items keep their insertion order
+        obj = items.pop(random.randrange(len(items)))
+        set.remove(self, obj)
+        self._unindex(obj)
         return obj
 
 
+def _func_argnames(func):
+    """Return the names of the parameters of func.
+
+    Plain functions are read straight from their code object, which is much
+    cheaper than inspect.signature(); anything else goes through inspect.
+
+    """
+    if (
+        inspect.isfunction(func) and
+        not hasattr(func, '__wrapped__') and
+        not hasattr(func, '__signature__')
+    ):
+        code = func.__code__
+        varargs = inspect.CO_VARARGS | inspect.CO_VARKEYWORDS
+        if not code.co_flags & varargs and not code.co_kwonlyargcount:
+            return code.co_varnames[:code.co_argcount]
+    return tuple(inspect.signature(func).parameters)
+
+
 def _register(command, func, context=None, kwargs={}):
     """Register func as a handler for the given command."""
     pattern = Pattern(command, context)
-    sig = inspect.signature(func)
-    func_argnames = set(sig.parameters)
-    when_argnames = set(pattern.argnames) | set(kwargs.keys())
+    func_argnames = sorted(_func_argnames(func))
+    when_argnames = sorted(pattern.argnames + list(kwargs))
     if func_argnames != when_argnames:
+        sig = inspect.signature(func)
         raise InvalidCommand(
             'The function %s%s has the wrong signature for @when(%r)' % (
                 func.__name__, sig, command
@@ -318,6 +474,14 @@ def _register(command, func, context=None, kwargs={}):
         )
 
     commands.append((pattern, func, kwargs))
+    _commands_changed()
+
+
+def _commands_changed():
+    """Discard everything derived from the list of registered commands."""
+    global _commands_by_first_word
+    _commands_by_first_word = None
+    _candidate_cache.clear()
 
 
 class Pattern:
@@ -332,6 +496,8 @@ class Pattern:
         self.orig_pattern = pattern
         _validate_context(context)
         self.pattern_context = context
+        self._ctx_prefix = context + CONTEXT_SEP if context else None
+        self._ctx_order = context.count(CONTEXT_SEP) + 1 if context else 0
         words = pattern.split()
         match = []
         argnames = []
@@ -361,13 +527,26 @@ class Pattern:
                     'capitals, not a mix.'
                 )
         self.argnames = argnames
-        self.prefix = []
+        prefix = []
         for w in match:
             if isinstance(w, Placeholder):
                 break
-            self.prefix.append(w)
-        self.pattern = match[len(self.prefix):]
+            prefix.append(w)
+        self.prefix = tuple(prefix)
+        self.pattern = tuple(match[len(prefix):])
         self.fixed = len(self.pattern) - self.placeholders
+        # The pattern split into its literal words, with None for each
+        # placeholder, and the placeholder names in order
+        self._literals = tuple(
+            None if isinstance(w, Placeholder) else w for w in self.pattern
+        )
+        self._ph_names = tuple(
+            w.name for w in self.pattern if isinstance(w, Placeholder)
+        )
+        if self.placeholders:
+            self._match_impl = self._match_generic
+        else:
+            self._match_impl = self._match_noargs
 
     def __repr__(self):
         ctx = ''
@@ -399,26 +578,50 @@ class Pattern:
             yield (have,)
             return
 
-        # Greedy - start by taking everything
-        other_groups = placeholders - 1
-        take = have - other_groups
-        while take > 0:
-            remain = have - take
-            if have >= placeholders - 1:
-                combos = Pattern.word_combinations(remain, other_groups)
-                for buckets in combos:
-                    yield (take,) + tuple(buckets)
-            take -= 1  # backtrack
+        # Each assignment is a choice of placeholders - 1 dividers between
+        # the words. Walk them in reverse lexicographic order so that earlier
+        # placeholders greedily take as many words as possible.
+        dividers = itertools.combinations(range(1, have), placeholders - 1)
+        for cuts in reversed(list(dividers)):
+            yield tuple(b - a for a, b in zip((0,) + cuts, cuts + (have,)))
 
     def is_active(self):
-        """Return True if a command is active in the current context."""
-        return _match_context(self.pattern_context, current_context)
+        """Return True if a command is active in the current context.
+
+        This is equivalent to ``_match_context(self.pattern_context,
+        current_context)``, using the separator-terminated context computed
+        when the pattern was created.
+
+        """
+        if self._ctx_prefix is None:
+            return True
+        if current_context is None:
+            return False
+        return (
+            current_context == self.pattern_context or
+            current_context.startswith(self._ctx_prefix)
+        )
 
     def ctx_order(self):
         """Return an integer indicating how nested the context is."""
-        if not self.pattern_context:
-            return 0
-        return self.pattern_context.count(CONTEXT_SEP) + 1
+        return self._ctx_order
+
+    def regex(self, tag):
+        """Return a regular expression matching this pattern.
+
+        The expression matches the input words joined by single spaces. Each
+        placeholder becomes a group named '<tag>_<name>' that greedily takes
+        as many words as it can, so earlier placeholders are preferred in
+        the same order as word_combinations().
+
+        """
+        parts = []
+        for w in self.prefix + self.pattern:
+            if isinstance(w, Placeholder):
+                parts.append(r'(?P<%s_%s>\S+(?: \S+)*)' % (tag, w.name))
+            else:
+                parts.append(re.escape(w))
+        return ' '.join(parts)
 
     def match(self, input_words):
         """Match a given list of input words against this pattern.
@@ -427,12 +630,18 @@ class Pattern:
         the pattern does not match.
 
         """
-        global current_context
+        return self._match_impl(input_words)
 
+    def _match_noargs(self, input_words):
+        """Match a pattern without placeholders, which is all prefix."""
+        return {} if tuple(input_words) == self.prefix else None
+
+    def _match_generic(self, input_words):
+        """Match a pattern with one or more placeholders."""
         if len(input_words) < len(self.argnames):
             return None
 
-        if input_words[:len(self.prefix)] != self.prefix:
+        if tuple(input_words[:len(self.prefix)]) != self.prefix:
             return None
 
         input_words = input_words[len(self.prefix):]
@@ -443,27 +652,36 @@ class Pattern:
             return None
 
         have = len(input_words) - self.fixed
+        if have < self.placeholders:
+            return None
 
+        if self.placeholders == 1:
+            # The pattern is the placeholder followed by literal words, so the
+            # placeholder must take everything up to those literals
+            if tuple(input_words[have:]) != self.pattern[1:]:
+                return None
+            return {self.argnames[0]: ' '.join(input_words[:have])}
+
+        # Every combination accounts for exactly the words in input_words,
+        # so the positions below never run past the end
+        literals = self._literals
+        names = self._ph_names
         for combo in self.word_combinations(have, self.placeholders):
             matches = {}
-            take = iter(combo)
-            inp = iter(input_words)
-            try:
-                for cword in self.pattern:
-                    if isinstance(cword, Placeholder):
-                        count = next(take)
-                        ws = []
-                        for _ in range(count):
-                            ws.append(next(inp))
-                        matches[cword.name] = ws
-                    else:
-                        word = next(inp)
-                        if cword != word:
-                            break
+            pos = 0
+            slot = 0
+            for literal in literals:
+                if literal is None:
+                    end = pos + combo[slot]
+                    matches[names[slot]] = input_words[pos:end]
+                    slot += 1
+                    pos = end
+                elif input_words[pos] == literal:
+                    pos += 1
                 else:
-                    return {k: ' '.join(v) for k, v in matches.items()}
-            except StopIteration:
-                continue
+                    break
+            else:
+                return {k: ' '.join(v) for k, v in matches.items()}
         return None
 
 
@@ -493,51 +711,144 @@ def help():
         print(c)
 
 
-def _available_commands():
-    """Return the list of available commands in the current context.
+def _command_ctx_order(command):
+    """Sort key ordering (pattern, func, kwargs) entries by context depth."""
+    return command[0]._ctx_order
+
+
+def _command_index():
+    """Return the registered commands grouped by the first word they match.
+
+    Each word maps to the commands whose prefix starts with that word plus
+    the commands that have no prefix, in registration order. The ``None``
+    key holds only the commands without a prefix.
 
-    The order will be the order in which they should be considered, which
-    corresponds to how deeply nested the context is.
+    """
+    global _commands_by_first_word
+    if _commands_by_first_word is None:
+        index = {None: [c for c in commands if not c[0].prefix]}
+        for pattern, _, _ in commands:
+            if pattern.prefix and pattern.prefix[0] not in index:
+                word = pattern.prefix[0]
+                index[word] = [
+                    c for c in commands
+                    if not c[0].prefix or c[0].prefix[0] == word
+                ]
+        _commands_by_first_word = index
+    return _commands_by_first_word
+
+
+def _candidate_matcher(ws):
+    """Return a matcher for the available commands that could match ws.
+
+    Only commands whose prefix starts with the first input word are
+    considered. They are combined into a single regular expression with one
+    alternative per command, in the order they should be tried: commands
+    for the most deeply nested context first, otherwise in registration
+    order. The matcher is a (regex, handlers, exact) tuple, where handlers
+    maps the group name of each alternative to a (func, kwargs, groups)
+    tuple and groups pairs each argument name with the group capturing it.
+    regex is None if no command could match.
+
+    exact maps the words of each command without placeholders to its
+    (func, kwargs), so those can be found with a single dict lookup. A
+    command is left out of exact if a command that is tried before it would
+    also match its words.
+
+    The matcher is cached per context and first word.
 
     """
-    available_commands = []
-    for c in commands:
-        pattern = c[0]
-        if pattern.is_active():
-            available_commands.append(c)
-    available_commands.sort(
-        key=lambda c: c[0].ctx_order(),
+    index = _command_index()
+    word = ws[0] if ws and ws[0] in index else None
+    key = (current_context, word)
+    if key in _candidate_cache:
+        return _candidate_cache[key]
+    candidates = [c for c in index[word] if c[0].is_active()]
+    candidates.sort(
+        key=_command_ctx_order,
         reverse=True,
     )
-    return available_commands
+    alternatives = []
+    handlers = {}
+    exact = {}
+    for i, (pattern, func, kwargs) in enumerate(candidates):
+        tag = 'c%d' % i
+        alternatives.append('(?P<%s>%s)' % (tag, pattern.regex(tag)))
+        handlers[tag] = (
+            func,
+            kwargs,
+            tuple((name, '%s_%s' % (tag, name)) for name in pattern.argnames),
+        )
+        words = pattern.prefix
+        if pattern.argnames or words in exact:
+            continue
+        if not any(c[0].match(words) is not None for c in candidates[:i]):
+            exact[words] = (func, kwargs)
+    regex = re.compile('|'.join(alternatives)) if alternatives else None
+    _candidate_cache[key] = matcher = (regex, handlers, exact)
+    return matcher
+
+
+def _find_command(ws):
+    """Find the command matching the input words ws.
+
+    Return a (func, args) tuple for the first available command that
+    matches, or None if no command matches.
+
+    """
+    regex, handlers, exact = _candidate_matcher(ws)
+    found = exact.get(ws)
+    if found is not None:
+        func, kwargs = found
+        return func, kwargs.copy()
+    if regex is None:
+        return None
+    m = regex.fullmatch(' '.join(ws))
+    if m is None:
+        return None
+    func, kwargs, groups = handlers[m.lastgroup]
+    args = kwargs.copy()
+    for name, group in groups:
+        args[name] = m.group(group)
+    return func, args
+
+
+def _split_command(cmd):
+    """Split a command typed by the user into a tuple of lowercase words."""
+    if not cmd.islower():
+        cmd = cmd.lower()
+    return tuple(cmd.split())
 
 
 def _handle_command(cmd):
     """Handle a command typed by the user."""
-    ws = cmd.lower().split()
-
-    for pattern, func, kwargs in _available_commands():
-        args = kwargs.copy()
-        matches = pattern.match(ws)
-        if matches is not None:
-            args.update(matches)
-            func(**args)
-            break
-    else:
+    ws = _split_command(cmd)
+
+    found = _find_command(ws)
+    if found is None:
         no_command_matches(cmd)
+    else:
+        func, args = found
+        func(**args)
     print()
 
 
 def start(help=True):
     """Run the game."""
+    try:
+        import readline  # noqa: adds readline semantics to input()
+    except ImportError:
+        pass
+
     if help:
         # Ugly, but we want to keep the arguments consistent
         help = globals()['help']
         qmark = Pattern('help')
-        qmark.prefix = ['?']
+        qmark.prefix = ('?',)
         qmark.orig_pattern = '?'
         commands.insert(0, (Pattern('help'), help, {}))
         commands.insert(0, (qmark, help, {}))
+        _commands_changed()
     while True:
         try:
             cmd = input(prompt()).strip()
@@ -551,6 +862,35 @@ def start(help=True):
         _handle_command(cmd)
 
 
+#: Strips leading and trailing whitespace from each line of a message.
+_SAY_STRIP = re.compile(r'^[ \t]*(.*?)[ \t]*$', re.M)
+
+#: The cached terminal width used by say(); see refresh_terminal_width().
+_TERM_WIDTH = None
+
+
+def refresh_terminal_width():
+    """Re-query the width of the terminal used to wrap text in say().
+
+    The width is looked up once on first use and cached; call this if the
+    terminal has been resized.
+
+    """
+    global _TERM_WIDTH
+    # Imported here so that games that never call say(), such as those
+    # running under PyScript, don't pay for it at import time
+    try:
+        from shutil import get_terminal_size
+    except ImportError:
+        try:
+            from backports.shutil_get_terminal_size import get_terminal_size
+        except ImportError:
+            def get_terminal_size(fallback=(80, 24)):
+                return fallback
+    _TERM_WIDTH = get_terminal_size()[0]
+    return _TERM_WIDTH
+
+
 def say(msg):
     """Print a message.
 
@@ -561,10 +901,13 @@ def say(msg):
     separately.
 
     """
+    import textwrap
+
     msg = str(msg)
-    msg = re.sub(r'^[ \t]*(.*?)[ \t]*$', r'\1', msg, flags=re.M)
-    width = get_terminal_size()[0]
-    paragraphs = re.split(r'\n(?:[ \t]*\n)', msg)
+    msg = _SAY_STRIP.sub(r'\1', msg)
+    width = _TERM_WIDTH or refresh_terminal_width()
+    # Blank lines are empty once stripped, so a plain split finds paragraphs
+    paragraphs = msg.split('\n\n')
     formatted = (textwrap.fill(p.strip(), width=width) for p in paragraphs)
     print('\n\n'.join(formatted))
 
@@ -573,40 +916,34 @@ commands = [
     (Pattern('quit'), sys.exit, {}),  # quit command is built-in
 ]
 
+#: The commands grouped by the first word of their prefix, built lazily by
+#: _command_index() and reset whenever commands are registered.
+_commands_by_first_word = None
+
+#: The candidate command matchers, keyed by context and first input word.
+_candidate_cache = {}
+
 
 # --- Dispatch ---
 
 # Custom dispatch function since adventurelib doesn't expose one
 def dispatch_command(cmd):
     """Handle a command and return the result instead of printing it."""
-    ws = cmd.lower().split()
+    ws = _split_command(cmd)
     
-    # Get available commands from adventurelib's internal function
-    available_commands = []
-    for c in commands:
-        pattern = c[0]
-        if pattern.is_active():
-            available_commands.append(c)
-    available_commands.sort(
-        key=lambda c: c[0].ctx_order(),
-        reverse=True,
-    )
-    
-    # Try to match the command
-    for pattern, func, kwargs in available_commands:
-        args = kwargs.copy()
-        matches = pattern.match(ws)
-        if matches is not None:
-            args.update(matches)
-            # Call the function and capture its return value
-            try:
-                result = func(**args)
-                return result if result is not None else "OK"
-            except Exception as e:
-                return f"Error: {str(e)}"
-    
-    # No command matched
-    return None
+    # Match the command against the commands that share its first word
+    found = _find_command(ws)
+    if found is None:
+        # No command matched
+        return None
+
+    # Call the function and capture its return value
+    func, args = found
+    try:
+        result = func(**args)
+        return result if result is not None else "OK"
+    except Exception as e:
+        return f"Error: {str(e)}"
 
 
 '''
@@ -625,7 +962,12 @@ class Direction(str, Enum):
     WEST = "west"
 
 
+_DIRECTION_VALUES = frozenset(d.value for d in Direction)
+
+
 class Item(AdvItem):
+    __slots__ = ('def_name', 'indef_name', 'description', '_bullet')
+
     def __init__(
         self,
         name: str,
@@ -638,9 +980,13 @@ class Item(AdvItem):
         self.def_name = def_name
         self.indef_name = indef_name
         self.description = description
+        # The line listing this item in the inventory
+        self._bullet = f'* {name}'
 
 
 class LockedExit:
+    __slots__ = ('is_locked', 'description', 'unlock_item')
+
     def __init__(self, description: str, unlock_item: Optional[Item] = None):
         self.is_locked: bool = True
         self.description: str = description
@@ -648,6 +994,15 @@ class LockedExit:
 
 
 class Room(AdvRoom):
+    # AdvRoom keeps a __dict__ for its direction links; the attributes Room
+    # adds itself live in slots.
+    __slots__ = (
+        'first_time_in_room', 'first_time_description', 'items', 'fixtures',
+        'locked_exits', 'is_dark', 'dark_safe_exit', 'dark_description',
+        'functional_description', 'illegal_direction_description',
+        'room_aliases', '_alias_keys',
+    )
+
     def __init__(
         self,
         static_description: Optional[str] = "",
@@ -660,7 +1015,7 @@ class Room(AdvRoom):
         is_dark: Optional[bool] = False,
         dark_safe_exit: Optional[Direction] = None,
         dark_description: Optional[str] = "The room is dark.",
-        room_aliases: Optional[list[str]] = None
+        room_aliases: Optional[tuple[str, ...]] = None
     ):
         super().__init__(static_description)
 
@@ -677,7 +1032,8 @@ class Room(AdvRoom):
         self.dark_description = dark_description
         self.functional_description = functional_description
         self.illegal_direction_description = illegal_direction_description
-        self.room_aliases = room_aliases if room_aliases is not None else []
+        self.room_aliases = tuple(room_aliases) if room_aliases is not None else ()
+        self._alias_keys = tuple(sys.intern(alias.lower()) for alias in self.room_aliases)
 
     def get_description(self):
         if self.is_dark:
@@ -704,15 +1060,18 @@ class GameState:
     CAN_FIND_WARDROBE_SECRET = False
     DISCOVERED_SEAGULLS = False
     
-    # State specific to long-term mode
-    OFFICE_COMPUTER = False
-    OFFICE_POSTER = False
-    OFFICE_STICKIES = False
-    OFFICE_PAINTINGS = False
-    OFFICE_TICKET = False
+    # State specific to long-term mode: OFFICE_* bits of what has been found
+    OFFICE_FOUND = 0
 
 game_state = GameState()
 
+OFFICE_POSTER = 0x01
+OFFICE_STICKIES = 0x02
+OFFICE_PAINTINGS = 0x04
+OFFICE_TICKET = 0x08
+OFFICE_COMPUTER = 0x10
+OFFICE_ALL = 0x1F
+
 
 """
 items.py
@@ -978,28 +1337,33 @@ cot = Item(
     description="A cot. It has blankets and a pillow. It doesn't look particularly comfortable..."
 )
 
+_NOTEBOOK_COVER = "A notebook with a cloverleaf on the cover."
+_NOTEBOOK_PAGES = " It contains many pages of cryptic writing. One page has a to-do list on it with a few items. One is a note to not forget to put the rug back before leaving. Another is a reminder to buy more crackers. Another is a reminder to call home. There's also on odd scrawl in the corner that says \"Polly wants a ↑→→↑\"."
+
 notebook = Item(
     'notebook',
     def_name='the notebook',
-    description="A notebook with a cloverleaf on the cover. It contains many pages of cryptic writing. One page has a to-do list on it with a few items. One is a note to not forget to put the rug back before leaving. Another is a reminder to buy more crackers. Another is a reminder to call home. There's also on odd scrawl in the corner that says \"Polly wants a ↑→→↑\"."
+    description=_NOTEBOOK_COVER + _NOTEBOOK_PAGES
 )
 
 notebook_glowing = Item(
     'notebook (glowing)', 'glowing notebook', 'notebook',
     def_name='the glowing notebook',
-    description="A notebook with a cloverleaf on the cover. It's now glowing? It contains many pages of cryptic writing. One page has a to-do list on it with a few items. One is a note to not forget to put the rug back before leaving. Another is a reminder to buy more crackers. Another is a reminder to call home. There's also on odd scrawl in the corner that says \"Polly wants a ↑→→↑\". There is some new glowing text that says \"Have you made the seagulls your friends yet?\"..."
+    description=_NOTEBOOK_COVER + " It's now glowing?" + _NOTEBOOK_PAGES + " There is some new glowing text that says \"Have you made the seagulls your friends yet?\"..."
 )
 
+_SHELF = "A simple wooden shelf."
+
 shelf_1 = Item(
     'shelf',
     def_name='the shelf',
-    description="A simple wooden shelf. There are some boxes of what looks like dried crackers on it."
+    description=_SHELF + " There are some boxes of what looks like dried crackers on it."
 )
 
 shelf_2 = Item(
     'shelf',
     def_name='the shelf',
-    description="A simple wooden shelf. There appears to be a red button behind the shelf."
+    description=_SHELF + " There appears to be a red button behind the shelf."
 )
 
 red_button = Item(
@@ -1050,16 +1414,19 @@ computer_on = Item(
     description="A yellowing beige computer and its CRT monitor sit on the desk. The screen shows the log in screen. The wallpaper for the login screen is very interesting. It depicts scores of pigeons escaping from a cage. There are three pigeons still in the cage, with five perched nearby, and eight flying off into the distance..."
 )
 
+_FILING_CABINET = "A dented metal filing cabinet with chipped olive-green paint stands against the wall."
+_FILING_CABINET_JUNK = " The bottom drawer seems to be filled with junk."
+
 filing_cabinet = Item(
     'filing cabinet', 'filing', 'cabinet',
     def_name='the filing cabinet',
-    description="A dented metal filing cabinet with chipped olive-green paint stands against the wall. You try to look into each drawer and all but the bottom drawer are locked. The bottom drawer seems to be filled with junk. You find a band poster in there though, and it looks pretty cool so you take it..."
+    description=_FILING_CABINET + " You try to look into each drawer and all but the bottom drawer are locked." + _FILING_CABINET_JUNK + " You find a band poster in there though, and it looks pretty cool so you take it..."
 )
 
 filing_cabinet_taken = Item(
     'filing cabinet', 'filing', 'cabinet',
     def_name='the filing cabinet',
-    description="A dented metal filing cabinet with chipped olive-green paint stands against the wall. All but the bottom drawer are locked. The bottom drawer seems to be filled with junk."
+    description=_FILING_CABINET + " All but the bottom drawer are locked." + _FILING_CABINET_JUNK
 )
 
 band_poster = Item(
@@ -1068,28 +1435,32 @@ band_poster = Item(
     description="A band poster for a band called \"The Glockenspielers\". The caption says \"What the Bell are you waiting for? The Bells are tolling now!\". You can't tell if it's a joke band or serious..."
 )
 
+_AREA_RUG = "An area rug covers much of the floor. It is a deep red and has intricate elegant lines traversing its surface."
+
 area_rug = Item(
     'rug', 'area rug',
     def_name='the area rug',
-    description="An area rug covers much of the floor. It is a deep red and has intricate elegant lines traversing its surface."
+    description=_AREA_RUG
 )
 
 area_rug_moved = Item(
     'rug', 'area rug',
     def_name='the area rug',
-    description="An area rug covers much of the floor. It is a deep red and has intricate elegant lines traversing its surface. You have flipped over one of the corners of the rug, revealing a safe hidden under the rug."
+    description=_AREA_RUG + " You have flipped over one of the corners of the rug, revealing a safe hidden under the rug."
 )
 
+_SAFE = "A heavy metal safe that was hidden under the rug. It is set into the floor."
+
 safe = Item(
     'safe', 'keypad',
     def_name='the safe',
-    description="A heavy metal safe that was hidden under the rug. It is set into the floor. It has a keypad on the front."
+    description=_SAFE + " It has a keypad on the front."
 )
 
 safe_open = Item(
     'safe', 'keypad',
     def_name='the open safe',
-    description="A heavy metal safe that was hidden under the rug. It is set into the floor. You have already opened it and taken the contents."
+    description=_SAFE + " You have already opened it and taken the contents."
 )
 
 bunny = Item(
@@ -1102,153 +1473,179 @@ bunny = Item(
 """
 rooms.py
 """
+def _desc(*parts):
+    """Join the fragments of a room description in a single pass."""
+    return "".join(parts)
+
+
 dark_room = Room(
-    functional_description=lambda self: (
-        "You are in a simple bedroom. There is a bed against the wall with a bedside table beside it."
-        + (" There is an old wooden wardrobe in the corner of the room that has a secret passage inside it." if wardrobe_found_secret in list(self.fixtures) else "")
-        + (" There is an old wooden wardrobe in the corner of the room. You feel oddly drawn to it..." if (wardrobe_with_secret in list(self.fixtures) or wardrobe_with_secret_investigated in list(self.fixtures)) else "")
-        + (" There is an old wooden wardrobe in the corner of the room." if (wardrobe in list(self.fixtures) or wardrobe_investigated in list(self.fixtures)) else "")
-        + " There is a door to the north."
+    functional_description=lambda self: _desc(
+        "You are in a simple bedroom. There is a bed against the wall with a bedside table beside it.",
+        " There is an old wooden wardrobe in the corner of the room that has a secret passage inside it." if wardrobe_found_secret in self.fixtures else "",
+        " There is an old wooden wardrobe in the corner of the room. You feel oddly drawn to it..." if (wardrobe_with_secret in self.fixtures or wardrobe_with_secret_investigated in self.fixtures) else "",
+        " There is an old wooden wardrobe in the corner of the room." if (wardrobe in self.fixtures or wardrobe_investigated in self.fixtures) else "",
+        " There is a door to the north.",
     ),
     is_dark=True,
     dark_safe_exit=Direction.NORTH,
     dark_description="You are in a pitch dark room. You can just make out a faint line of light coming from under a doorway to the north. You don't feel comfortable navigating the room in the dark.",
     fixtures=[wardrobe, bed, bedside],
-    room_aliases=["bedroom", "wardrobe room"]
+    room_aliases=("bedroom", "wardrobe room")
 )
 
 secret_room = Room(
     is_dark=True,
     dark_description="You've gone into the opening, but it's very dark inside... You can't see much other than the light coming back from the opening.",
-    functional_description=lambda self: (
-        "Looking around with the flashlight, you can see a sparsely furnished room."
-        + (" There is a small cot to one side and a shelf that looks to have many cardboard boxes on it." if cracker_boxes in list(self.items) else " There is a small cot to one side and a shelf that is now empty.")
-        + " On the far side of the room to you is a small metal table with a cushioned chair."
-        + ("It looks like there's something on the table." if shelf_1 in list(self.fixtures) else "")
+    functional_description=lambda self: _desc(
+        "Looking around with the flashlight, you can see a sparsely furnished room.",
+        " There is a small cot to one side and a shelf that looks to have many cardboard boxes on it." if cracker_boxes in self.items else " There is a small cot to one side and a shelf that is now empty.",
+        " On the far side of the room to you is a small metal table with a cushioned chair.",
+        "It looks like there's something on the table." if shelf_1 in self.fixtures else "",
     ),
     fixtures=[metal_table_1, shelf_1, cushioned_chair, cot],
     items=[cracker_boxes],
-    room_aliases=["secret", "secret room"]
+    room_aliases=("secret", "secret room")
 )
 
 south_hallway = Room(
     first_time_description="You step into a narrow, dimly lit hallway. The air is damp and musty, and the walls are lined with old, peeling wallpaper. The hallway stretches off to the north. There is a door to the south.",
     static_description="You are in a narrow hallway, dimly lit by a single bulb. The hallway stretches off to the north. There is a door to the south.",
-    room_aliases=["south hall", "south hallway"]
+    room_aliases=("south hall", "south hallway")
 )
 
 north_hallway = Room(
     static_description="You are in a narrow, well lit, hallway. There is a door to the north, and another door to the east. The hallway stretches off to the south.",
-    room_aliases=["north hall", "north hallway"]
+    room_aliases=("north hall", "north hallway")
 )
 
 east_hallway = Room(
-    functional_description=lambda self: (
-        "You are in a narrow hallway, dimly lit by a few sparse bulbs."
-        + (" On the floor you can see what appears to be an empty tin can." if empty_can in list(self.items) else "")
-        + " There is a door to the east. The hallway stretches off to the west."
+    functional_description=lambda self: _desc(
+        "You are in a narrow hallway, dimly lit by a few sparse bulbs.",
+        " On the floor you can see what appears to be an empty tin can." if empty_can in self.items else "",
+        " There is a door to the east. The hallway stretches off to the west.",
     ),
     items=[empty_can],
-    room_aliases=["east hall", "east hallway"]
+    room_aliases=("east hall", "east hallway")
 )
 
 metal_gate = LockedExit("There is no handle for the metal gate. You try pushing and pulling on it but nothing seems to happen.", unlock_item=None)
 heavy_wooden_door = LockedExit("You try the door, but it seems to be locked tight. You notice a small keyhole just below the handle.", unlock_item=key)
 
 west_hallway = Room(
-    functional_description=lambda self: (
-        "You are in a narrow, well lit, hallway. There is a heavy-looking wooden door to the west, and an iron gate to the south."
-        + (" You notice that the iron gate looks to be slightly ajar..." if not metal_gate.is_locked else "")
-        + " The hallway stretches off to the east."
+    functional_description=lambda self: _desc(
+        "You are in a narrow, well lit, hallway. There is a heavy-looking wooden door to the west, and an iron gate to the south.",
+        " You notice that the iron gate looks to be slightly ajar..." if not metal_gate.is_locked else "",
+        " The hallway stretches off to the east.",
     ),
     locked_exits={
         Direction.WEST: heavy_wooden_door,
         Direction.SOUTH: metal_gate
     },
-    room_aliases=["west hall", "west hallway"]
+    room_aliases=("west hall", "west hallway")
 )
 
 central_hallway = Room(
-    functional_description=lambda self: (
-        "You are in an intersection of hallways. There are hallways to the north, south, east, and west. The hallways seem brighter to the west and north than to the south and east."
-        + (" It looks like there is something on the floor in the distance of the east hallway." if empty_can in list(east_hallway.items) else "")
-        + (" As you are looking around you see something move in the shadows in your peripheral vision. Looking closer, you don't seem to see anything?" if game_state.CAT_HIDDEN and not game_state.CAT_OBTAINED else "")
-        + (" In the shadows you see big reflective green eyes staring at you." if not game_state.CAT_HIDDEN and not game_state.CAT_OBTAINED else "")
-        + (" There is a cat at your feet, purring and happily eating the food from the can." if cat in list(self.items) else "")
+    functional_description=lambda self: _desc(
+        "You are in an intersection of hallways. There are hallways to the north, south, east, and west. The hallways seem brighter to the west and north than to the south and east.",
+        " It looks like there is something on the floor in the distance of the east hallway." if empty_can in east_hallway.items else "",
+        " As you are looking around you see something move in the shadows in your peripheral vision. Looking closer, you don't seem to see anything?" if game_state.CAT_HIDDEN and not game_state.CAT_OBTAINED else "",
+        " In the shadows you see big reflective green eyes staring at you." if not game_state.CAT_HIDDEN and not game_state.CAT_OBTAINED else "",
+        " There is a cat at your feet, purring and happily eating the food from the can." if cat in self.items else "",
     ),
-    room_aliases=["central hall", "central hallway", "centre hall", "centre hallway", "intersection hall", "intersection hallway", "intersection"]
+    room_aliases=("central hall", "central hallway", "centre hall", "centre hallway", "intersection hall", "intersection hallway", "intersection")
 )
 
 gated_hallway = Room(
-    functional_description=lambda self: (
-        "You are in a narrow, well lit, hallway. The ground seems to be sloping upwards. There is a metal gate to the north and sturdy metal door to the south. There seems to be light coming from behind the door to the south."
-    ),
-    room_aliases=["gated hall", "gated hallway", "gate hall", "gate hallway"]
+    static_description="You are in a narrow, well lit, hallway. The ground seems to be sloping upwards. There is a metal gate to the north and sturdy metal door to the south. There seems to be light coming from behind the door to the south.",
+    room_aliases=("gated hall", "gated hallway", "gate hall", "gate hallway")
 )
 
 supply_closet = Room(
-    functional_description=lambda self: (
-        "You are in a cramped supply closet. Various supplies are stored on shelving along the walls, or stacked in haphazard piles. On the far wall there is a cat poster and a small metal panel door."
-        + (" The panel seems lightly ajar." if breaker_closed not in list(self.fixtures) else "")
+    functional_description=lambda self: _desc(
+        "You are in a cramped supply closet. Various supplies are stored on shelving along the walls, or stacked in haphazard piles. On the far wall there is a cat poster and a small metal panel door.",
+        "" if breaker_closed in self.fixtures else " The panel seems lightly ajar.",
     ),
     fixtures=[breaker_closed, supplies, cat_poster],
-    room_aliases=["supply closet", "supplies closet", "supply", "supplies", "closet"]
+    room_aliases=("supply closet", "supplies closet", "supply", "supplies", "closet")
+)
+
+# Crates fragment indexed by (crowbar present) | (open_crates present) << 1
+_STORAGE_ROOM_CRATES = (
+    "",
+    " Resting on one of the crates is a worn, red crowbar.",
+    " Some of the boxes have been opened.",
+    " Resting on one of the crates is a worn, red crowbar. Some of the boxes have been opened.",
 )
 
 storage_room = Room(
-    functional_description=lambda self: (
-        "You are in a storage room filled with crates. Some crates are labeled with strange symbols, while others are just plain wooden boxes. Some of the lightbulbs are out, casting shadows across the room and crates."
-        + (" Resting on one of the crates is a worn, red crowbar." if crowbar in list(self.items) else "")
-        + (" Some of the boxes have been opened." if open_crates in list(self.fixtures) else "")
-        + (" There are still " + ", ".join(item.name for item in self.items) + " in the crates..." if len(self.items) > 0 else "")
+    functional_description=lambda self: _desc(
+        "You are in a storage room filled with crates. Some crates are labeled with strange symbols, while others are just plain wooden boxes. Some of the lightbulbs are out, casting shadows across the room and crates.",
+        _STORAGE_ROOM_CRATES[(crowbar in self.items) | (open_crates in self.fixtures) << 1],
+        f" There are still {self.items.names()} in the crates..." if self.items else "",
     ),
     items=[crowbar],
     fixtures=[crates],
-    room_aliases=["storage room", "storage"]
+    room_aliases=("storage room", "storage")
 )
 
 mess = Room(
-    functional_description=lambda self: (
-        "You are in an eating area. There are several tables and chairs arranged for dining. The room is clean and well-maintained."
-        + (" It looks like there is something on one of the tables in the middle of the room." if unobtainable_brass_key not in list(self.items) and table in list(self.fixtures) else "")
-        + (" It looks like there is a small brass key on one of the tables in the middle of the room." if unobtainable_brass_key in list(self.items) else "")
-        + (" In one of the corners you see a small vent." if vent in list(self.fixtures) or vent_empty in list(self.fixtures) else "")
-        + " There is a door to the south and a door to the west."
+    functional_description=lambda self: _desc(
+        "You are in an eating area. There are several tables and chairs arranged for dining. The room is clean and well-maintained.",
+        " It looks like there is something on one of the tables in the middle of the room." if unobtainable_brass_key not in self.items and table in self.fixtures else "",
+        " It looks like there is a small brass key on one of the tables in the middle of the room." if unobtainable_brass_key in self.items else "",
+        " In one of the corners you see a small vent." if vent in self.fixtures or vent_empty in self.fixtures else "",
+        " There is a door to the south and a door to the west.",
     ),
     is_dark=True,
     dark_safe_exit=Direction.WEST,
     dark_description="You are in a pitch dark room. You can just make out a faint line of light coming from under a doorway to the west. You don't feel comfortable navigating the room in the dark.",
     fixtures=[table],
-    room_aliases=["eating room", "eating area", "dining room", "mess hall", "mess", "dining", "eating"]
+    room_aliases=("eating room", "eating area", "dining room", "mess hall", "mess", "dining", "eating")
+)
+
+# Counter fragment indexed by (flashlight_dead present) | (closed_can present) << 1
+_KITCHEN_COUNTER = (
+    "",
+    " On the counter you notice a flashlight.",
+    " On the counter you notice an unopened can of food.",
+    " On the counter you notice an unopened can of food and a flashlight.",
 )
 
 kitchen = Room(
-    functional_description=lambda self: (
-        "You are in a small kitchen. Basic appliances line the cramped space. A fridge hums quietly against one wall."
-        + (" On the counter you notice an unopened can of food and a flashlight." if closed_can in list(self.items) and flashlight_dead in list(self.items) else "")
-        + (" On the counter you notice an unopened can of food." if closed_can in list(self.items) and flashlight_dead not in list(self.items) else "")
-        + (" On the counter you notice a flashlight." if closed_can not in list(self.items) and flashlight_dead in list(self.items) else "")
+    functional_description=lambda self: _desc(
+        "You are in a small kitchen. Basic appliances line the cramped space. A fridge hums quietly against one wall.",
+        _KITCHEN_COUNTER[(flashlight_dead in self.items) | (closed_can in self.items) << 1],
     ),
     items=[flashlight_dead, closed_can],
     fixtures=[fridge],
-    room_aliases=["kitchen", "cooking area", "cooking room"]
+    room_aliases=("kitchen", "cooking area", "cooking room")
+
+)
+
+_OFFICE_HEAD = "You are in what appears to be an office. There is a desk with a computer terminal as well as several filing cabinets."
+_OFFICE_MIDDLE = " There are some fancy paintings on the wall, and the hardwood floor has a large area rug covering a large section of it."
+_OFFICE_TAIL = " The room gives off an elegant and sophisticated air."
 
+# Desk fragment indexed by (stickies present) | (flight_ticket present) << 1
+_OFFICE_DESK = (
+    "",
+    " There are some sticky notes on the desk.",
+    " There is some kind of ticket sitting one of the filing cabinets.",
+    " There are some sticky notes on the desk and some kind of ticket sitting one of the filing cabinets.",
 )
 
 office = Room(
-    functional_description=lambda self: (
-        "You are in what appears to be an office. There is a desk with a computer terminal as well as several filing cabinets."
-        + (" The computer is off." if computer in list(self.fixtures) else " The computer is on.")
-        + (" There are some sticky notes on the desk and some kind of ticket sitting one of the filing cabinets." if stickies in list(self.items) and flight_ticket in list(self.items) else "")
-        + (" There are some sticky notes on the desk." if stickies in list(self.items) and flight_ticket not in list(self.items) else "")
-        + (" There is some kind of ticket sitting one of the filing cabinets." if stickies not in list(self.items) and flight_ticket in list(self.items) else "")
-        + " There are some fancy paintings on the wall, and the hardwood floor has a large area rug covering a large section of it."
-        + (" The corner of the rug is flipped over, revealing a safe hidden under the rug." if safe in list(self.fixtures) else "") 
-        +" The room gives off an elegant and sophisticated air."
+    functional_description=lambda self: _desc(
+        _OFFICE_HEAD,
+        " The computer is off." if computer in self.fixtures else " The computer is on.",
+        _OFFICE_DESK[(stickies in self.items) | (flight_ticket in self.items) << 1],
+        _OFFICE_MIDDLE,
+        " The corner of the rug is flipped over, revealing a safe hidden under the rug." if safe in self.fixtures else "",
+        _OFFICE_TAIL,
     ),
     fixtures=[computer, filing_cabinet, area_rug, paintings],
     items=[stickies, flight_ticket],
-    room_aliases=["office", "computer room"]
+    room_aliases=("office", "computer room")
 )
 
 # 5x5 Beach Room Grid
@@ -1288,17 +1685,17 @@ beach_ne_n = Room(
 
 # 0,4
 beach_ne_ne = Room(
-    functional_description=lambda self: (
-        "You are standing on the beach."
-        + (" There are some seagulls nearby." if "seagulls" in self.fixtures else "") # Must be "if "seagulls" in self.fixtures" for unknown reasons
-        + " The beach seems to stretch off as far off into the distance as you can see to the north and east."
+    functional_description=lambda self: _desc(
+        "You are standing on the beach.",
+        " There are some seagulls nearby." if seagulls in self.fixtures else "",
+        " The beach seems to stretch off as far off into the distance as you can see to the north and east.",
     ),
     illegal_direction_description={
         Direction.NORTH: "The beach seems to stretch on forever. It's probably not a good idea to venture too far...",
         Direction.EAST: "The beach seems to stretch on forever. It's probably not a good idea to venture too far...",
     },
     fixtures=[seagulls],
-    room_aliases=["seagull", "seagulls"]
+    room_aliases=("seagull", "seagulls")
 )
 
 # 1,0
@@ -1349,7 +1746,7 @@ beach_w = Room(
 outside_door = Room(
     first_time_description="You step out into the glaring light of day. As your eyes adjust, you see deep blue water off in the distance and the muted sound of waves crashing against the shore fills your ears. The small concrete pad you stand on appears to be above the tide line. Looking around you see soft white sand stretching out in every direction. You see a small wooden shed off to the east. The door back to the underground is here.",
     static_description="You are outside on a sandy beach. There is a small concrete pad with the door back to the underground here. You see a small wooden shed off to the east.",
-    room_aliases=["beach", "outside", "outside door", "beach door"]
+    room_aliases=("beach", "outside", "outside door", "beach door")
 )
 
 # 2,3 - Your existing outside_shed
@@ -1440,184 +1837,141 @@ beach_se_se = Room(
 )
 
 shed = Room(
-    functional_description=lambda self: (
-        "You are inside a small wooden shed. It's dimly lit by a single small window. The walls are lined with maps and nautical memorabilia."
-        + (" There is a workbench off to the side and it looks like it has a phone and some papers scattered about." if papers in list(self.items) else " There is a workbench off to the side and it looks like it has a phone on it.")
-    ),    
+    functional_description=lambda self: _desc(
+        "You are inside a small wooden shed. It's dimly lit by a single small window. The walls are lined with maps and nautical memorabilia.",
+        " There is a workbench off to the side and it looks like it has a phone and some papers scattered about." if papers in self.items else " There is a workbench off to the side and it looks like it has a phone on it.",
+    ),
     fixtures=[window_inside, phone, maps, workbench, nautical_memorabilia],
     items=[papers],
-    room_aliases=["shed", "phone room"]
+    room_aliases=("shed", "phone room")
 )
 
 all_rooms = (dark_room, secret_room, south_hallway, north_hallway, east_hallway, west_hallway, central_hallway, gated_hallway, supply_closet, storage_room, mess, kitchen, office, beach_nw_nw, beach_nw_n, beach_n_n, beach_ne_n, beach_ne_ne, beach_nw_w, beach_nw, beach_n, beach_ne, beach_ne_e, beach_w_w, beach_w, outside_door, outside_shed, beach_e_e, beach_sw_w, beach_sw, beach_s, beach_se, beach_se_e, beach_sw_sw, beach_sw_s, beach_s_s, beach_se_s, beach_se_se, shed)
 
+@cache
 def get_room_aliases():
     """Set up room aliases for easier access."""
     room_aliases = {}
     for room in all_rooms:
-        for alias in room.room_aliases:
-            room_aliases[alias.lower()] = room
+        for alias in room._alias_keys:
+            room_aliases[alias] = room
 
     return room_aliases
 
+# Connections between the indoor rooms. Each edge is listed once; the
+# reverse direction is linked by AdvRoom.__setattr__.
+EDGES = (
+    (central_hallway, Direction.SOUTH, south_hallway),
+    (central_hallway, Direction.NORTH, north_hallway),
+    (central_hallway, Direction.EAST, east_hallway),
+    (central_hallway, Direction.WEST, west_hallway),
+    (north_hallway, Direction.EAST, supply_closet),
+    (north_hallway, Direction.NORTH, storage_room),
+    (south_hallway, Direction.SOUTH, dark_room),
+    (east_hallway, Direction.EAST, mess),
+    (mess, Direction.SOUTH, kitchen),
+    (west_hallway, Direction.WEST, office),
+    (west_hallway, Direction.SOUTH, gated_hallway),
+)
+
+# 5x5 beach grid, north to south and west to east
+BEACH_GRID = (
+    (beach_nw_nw, beach_nw_n, beach_n_n, beach_ne_n, beach_ne_ne),
+    (beach_nw_w, beach_nw, beach_n, beach_ne, beach_ne_e),
+    (beach_w_w, beach_w, outside_door, outside_shed, beach_e_e),
+    (beach_sw_w, beach_sw, beach_s, beach_se, beach_se_e),
+    (beach_sw_sw, beach_sw_s, beach_s_s, beach_se_s, beach_se_se),
+)
+
 # Room connections
 def setup_room_connections():
     """Set up all room connections."""
-    central_hallway.south = south_hallway
-    central_hallway.north = north_hallway
-    central_hallway.east = east_hallway
-    central_hallway.west = west_hallway
-
-    north_hallway.east = supply_closet
-    north_hallway.north = storage_room
-
-    south_hallway.south = dark_room
-
-    east_hallway.east = mess
-    mess.south = kitchen
-
-    west_hallway.west = office
-    west_hallway.south = gated_hallway
-
-    # Outside beach grid connections
-    # Row 0 connections
-    beach_nw_nw.east = beach_nw_n
-    beach_nw_nw.south = beach_nw_w
-
-    beach_nw_n.west = beach_nw_nw
-    beach_nw_n.east = beach_n_n
-    beach_nw_n.south = beach_nw
-
-    beach_n_n.west = beach_nw_n
-    beach_n_n.east = beach_ne_n
-    beach_n_n.south = beach_n
-
-    beach_ne_n.west = beach_n_n
-    beach_ne_n.east = beach_ne_ne
-    beach_ne_n.south = beach_ne
-
-    beach_ne_ne.west = beach_ne_n
-    beach_ne_ne.south = beach_ne_e
-
-    # Row 1 connections
-    beach_nw_w.north = beach_nw_nw
-    beach_nw_w.east = beach_nw
-    beach_nw_w.south = beach_w_w
-
-    beach_nw.north = beach_nw_n
-    beach_nw.west = beach_nw_w
-    beach_nw.east = beach_n
-    beach_nw.south = beach_w
-
-    beach_n.north = beach_n_n
-    beach_n.west = beach_nw
-    beach_n.east = beach_ne
-    beach_n.south = outside_door
-
-    beach_ne.north = beach_ne_n
-    beach_ne.west = beach_n
-    beach_ne.east = beach_ne_e
-    beach_ne.south = outside_shed
-
-    beach_ne_e.north = beach_ne_ne
-    beach_ne_e.west = beach_ne
-    beach_ne_e.south = beach_e_e
-
-    # Row 2 connections
-    beach_w_w.north = beach_nw_w
-    beach_w_w.east = beach_w
-    beach_w_w.south = beach_sw_w
-
-    beach_w.north = beach_nw
-    beach_w.west = beach_w_w
-    beach_w.east = outside_door
-    beach_w.south = beach_sw
-
-    outside_door.north = beach_n
-    outside_door.west = beach_w
-    outside_door.east = outside_shed
-    outside_door.south = beach_s
-
-    outside_shed.north = beach_ne
-    outside_shed.west = outside_door
-    outside_shed.east = beach_e_e
-    outside_shed.south = beach_se
-
-    beach_e_e.north = beach_ne_e
-    beach_e_e.west = outside_shed
-    beach_e_e.south = beach_se_e
-
-    # Row 3 connections
-    beach_sw_w.north = beach_w_w
-    beach_sw_w.east = beach_sw
-    beach_sw_w.south = beach_sw_sw
-
-    beach_sw.north = beach_w
-    beach_sw.west = beach_sw_w
-    beach_sw.east = beach_s
-    beach_sw.south = beach_sw_s
-
-    beach_s.north = outside_door
-    beach_s.west = beach_sw
-    beach_s.east = beach_se
-    beach_s.south = beach_s_s
-
-    beach_se.north = outside_shed
-    beach_se.west = beach_s
-    beach_se.east = beach_se_e
-    beach_se.south = beach_se_s
-
-    beach_se_e.north = beach_e_e
-    beach_se_e.west = beach_se
-    beach_se_e.south = beach_se_se
-
-    # Row 4 connections
-    beach_sw_sw.north = beach_sw_w
-    beach_sw_sw.east = beach_sw_s
-
-    beach_sw_s.north = beach_sw
-    beach_sw_s.west = beach_sw_sw
-    beach_sw_s.east = beach_s_s
-
-    beach_s_s.north = beach_s
-    beach_s_s.west = beach_sw_s
-    beach_s_s.east = beach_se_s
-
-    beach_se_s.north = beach_se
-    beach_se_s.west = beach_s_s
-    beach_se_s.east = beach_se_se
-
-    beach_se_se.north = beach_se_e
-    beach_se_se.west = beach_se_s
+    for room, direction, other in EDGES:
+        setattr(room, direction.value, other)
+
+    # Outside beach grid connections, wired east and south only
+    for row, cells in enumerate(BEACH_GRID):
+        for col, room in enumerate(cells):
+            if col + 1 < len(cells):
+                room.east = cells[col + 1]
+            if row + 1 < len(BEACH_GRID):
+                room.south = BEACH_GRID[row + 1][col]
 
 # Initialize room connections
 setup_room_connections()
 
 room_aliases = get_room_aliases()
 
+# Which way "go door" leads from rooms with a single ordinary door
+DOOR_DIR = {
+    dark_room: Direction.NORTH,
+    south_hallway: Direction.SOUTH,
+    east_hallway: Direction.EAST,
+    kitchen: Direction.NORTH,
+    west_hallway: Direction.WEST,
+    office: Direction.EAST,
+    supply_closet: Direction.WEST,
+    storage_room: Direction.SOUTH,
+}
+
+# Moves that lead somewhere other than through a compass exit, keyed by the
+# room and the direction typed
+SPECIAL_NAV = {
+    (gated_hallway, Direction.SOUTH.value): outside_door,
+    (outside_door, 'underground'): gated_hallway,
+    (gated_hallway, 'door'): outside_door,
+    (outside_door, 'door'): gated_hallway,
+    (outside_shed, 'door'): shed,
+    (shed, 'door'): outside_shed,
+}
+
+# Rooms with two doors, which need "go DIRECTION door" to pick one
+TWO_DOOR_ROOMS = {
+    mess: frozenset((Direction.WEST, Direction.SOUTH)),
+    north_hallway: frozenset((Direction.EAST, Direction.NORTH)),
+}
+
+# Which way "go gate" leads
+GATE_DIR = {
+    west_hallway: Direction.SOUTH,
+    gated_hallway: Direction.NORTH,
+}
+
+# Words for going into and back out of the wardrobe passage
+_WARDROBE_ENTER = frozenset({'wardrobe', 'darkness', 'opening', 'inside'})
+_WARDROBE_EXIT_DARK = frozenset({'wardrobe', 'light', 'opening', 'back'})
+_WARDROBE_EXIT_LIT = frozenset({'wardrobe', 'opening', 'back'})
+
+# Names for things that are not fixtures but can still have items used on them
+_HEAVY_DOOR_NAMES = frozenset({'door', 'heavy door', 'wooden door', 'heavy wooden door'})
+_HIDDEN_CAT_NAMES = frozenset({'cat', 'shadow'})
+
 
 '''
 game_state.py
 '''
+# Office items that count towards OFFICE_ALL when looked at
+OFFICE_ITEM_BITS = {
+    band_poster: OFFICE_POSTER,
+    stickies: OFFICE_STICKIES,
+    paintings: OFFICE_PAINTINGS,
+    flight_ticket: OFFICE_TICKET,
+}
+
 def set_state_flag(item_obj):
-    if item_obj == band_poster:
-        game_state.OFFICE_POSTER = True
-    elif item_obj == stickies:
-        game_state.OFFICE_STICKIES = True
-    elif item_obj == paintings:
-        game_state.OFFICE_PAINTINGS = True
-    elif item_obj == flight_ticket:
-        game_state.OFFICE_TICKET = True
-    elif item_obj == bunny:
-        ADDITIONAL_STATE_TO_RESPOND[ADDITIONAL_STATE_KEYS.OBSERVED_BUNNY] = "true"
+    bit = OFFICE_ITEM_BITS.get(item_obj)
+    if bit is not None:
+        game_state.OFFICE_FOUND |= bit
+    elif item_obj is bunny:
+        ADDITIONAL_STATE_TO_RESPOND[OBSERVED_BUNNY] = "true"
     else:
         return
 
     check_if_all_office_collected()
 
 def check_if_all_office_collected():
-    if game_state.OFFICE_POSTER and game_state.OFFICE_STICKIES and game_state.OFFICE_PAINTINGS and game_state.OFFICE_TICKET and game_state.OFFICE_COMPUTER:
-        ADDITIONAL_STATE_TO_RESPOND[ADDITIONAL_STATE_KEYS.OFFICE_ALL_FOUND] = "true"
+    if game_state.OFFICE_FOUND == OFFICE_ALL:
+        ADDITIONAL_STATE_TO_RESPOND[OFFICE_ALL_FOUND] = "true"
         controller_wardrobe()
 '''
 phone_validator.py
@@ -1655,18 +2009,21 @@ app.py
 '''
 SAFE_NUMBER: str = '93247'
 
+# A well-formed safe code: exactly five decimal digits
+_SAFE_RE = re.compile(r'\d{5}')
+
 RESPONSE_UNKNOWN = "I don't understand that. If you need help, just ask me to 'explain'."
 
-class ADDITIONAL_STATE_KEYS(str, Enum):
-    CALL_WITH_HINT = "call_with_hint"
-    HINT_INDEX = "hint_index"
-    SEAGULLS_FOUND = "seagulls_found"
+# Keys of the additional state sent along with a reply
+CALL_WITH_HINT: Final = "call_with_hint"
+HINT_INDEX: Final = "hint_index"
+SEAGULLS_FOUND: Final = "seagulls_found"
 
-    # State specific to long-term mode
-    OFFICE_ALL_FOUND = "office_all_found"
-    OBSERVED_BUNNY = "observed_bunny"
+# State specific to long-term mode
+OFFICE_ALL_FOUND: Final = "office_all_found"
+OBSERVED_BUNNY: Final = "observed_bunny"
 
-ADDITIONAL_STATE_TO_RESPOND: dict[ADDITIONAL_STATE_KEYS, str] = {}
+ADDITIONAL_STATE_TO_RESPOND: dict[str, str] = {}
 
 # Manually set debug mode
 debug_mode = True
@@ -1690,8 +2047,8 @@ def phone_number(phone):
         return "I don't know how to dial that..."
 
     set_context(Context.EXPLORING)
-    ADDITIONAL_STATE_TO_RESPOND[ADDITIONAL_STATE_KEYS.CALL_WITH_HINT] = phone
-    ADDITIONAL_STATE_TO_RESPOND[ADDITIONAL_STATE_KEYS.HINT_INDEX] = str(random.randint(0, 1))
+    ADDITIONAL_STATE_TO_RESPOND[CALL_WITH_HINT] = phone
+    ADDITIONAL_STATE_TO_RESPOND[HINT_INDEX] = str(random.randint(0, 1))
     return "You dial the number. The number rings for a moment... then connects! You hear the clicking and whirring of what sounds like a phone switchboard and the line goes dead..."
 
 
@@ -1701,11 +2058,13 @@ def using_safe(digits):
 
     stripped_digits = digits.strip()
 
-    if not stripped_digits.isdigit():
-        return "I can only enter digits..."
-    
-    if len(stripped_digits) != 5:
-        return "I can only enter five digits..."
+    # Only look closer at codes that are not plainly five digits
+    if not _SAFE_RE.fullmatch(stripped_digits):
+        if not stripped_digits.isdigit():
+            return "I can only enter digits..."
+
+        if len(stripped_digits) != 5:
+            return "I can only enter five digits..."
     
     if stripped_digits == SAFE_NUMBER:
         set_context(Context.EXPLORING)
@@ -1727,6 +2086,25 @@ def push_button():
         return "You push the button. Nothing seemed happened this time..."
 
 
+def require_light(func):
+    """Decorate a command handler so that it refuses to run in a dark room."""
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        if current_room.is_dark:
+            return "The room is too dark to do anything."
+        return func(*args, **kwargs)
+    return wrapper
+
+
+def _dark_direction_ok(room, direction):
+    """Return True if the player can head in direction, given the room's light."""
+    return (
+        not room.is_dark or
+        direction not in _DIRECTION_VALUES or
+        direction == room.dark_safe_exit
+    )
+
+
 @when("look", context=Context.EXPLORING)
 @when("investigate", context=Context.EXPLORING)
 def look_room():
@@ -1737,24 +2115,17 @@ def look_room():
 @when("go DIRECTION door", context=Context.EXPLORING)
 def go_direction_door(direction):
     global current_room
+    room = current_room
 
     # Check trying to navigate a dark room
-    if current_room.is_dark and direction in [d.value for d in Direction] and direction != current_room.dark_safe_exit:
+    if not _dark_direction_ok(room, direction):
         return "The room is too dark to navigate that way."
 
     # Handle two-door rooms specially
-    if current_room == mess:
-        if direction == Direction.WEST:
-            return go(Direction.WEST)
-        elif direction == Direction.SOUTH:
-            return go(Direction.SOUTH)
-        else:
-            return "There is no door that way."
-    elif current_room == north_hallway:
-        if direction == Direction.EAST:
-            return go(Direction.EAST)
-        elif direction == Direction.NORTH:
-            return go(Direction.NORTH)
+    doors = TWO_DOOR_ROOMS.get(room)
+    if doors is not None:
+        if direction in doors:
+            return go(Direction(direction))
         else:
             return "There is no door that way."
     else:
@@ -1769,11 +2140,12 @@ def go_direction_door(direction):
 @when("look under area rug", context=Context.EXPLORING)
 def move_rug():
     global current_room
+    room = current_room
 
-    if current_room == office and area_rug in list(current_room.fixtures):
-        current_room.fixtures.remove(area_rug)
-        current_room.fixtures.add(area_rug_moved)
-        current_room.fixtures.add(safe)
+    if room is office and area_rug in room.fixtures:
+        room.fixtures.remove(area_rug)
+        room.fixtures.add(area_rug_moved)
+        room.fixtures.add(safe)
         return "You flip over one of the corner of the rug. Hidden underneath, you find a safe set into the floor..."
     else:
         return "The rug is already flipped over. Hidden underneath is a safe set into the floor..."
@@ -1783,11 +2155,12 @@ def move_rug():
 @when("move DIRECTION", context=Context.EXPLORING)
 def go(direction):
     global current_room
+    room = current_room
 
     # Handling for quick navigation by room name
     if direction in room_aliases:
         new_room = room_aliases[direction]
-        if new_room == current_room:
+        if new_room is room:
             return "You are already here."
         else:
             if debug_mode or not new_room.first_time_in_room:
@@ -1797,105 +2170,150 @@ def go(direction):
                 return "You can't go that way."
 
     # Check trying to navigate a dark room
-    if current_room.is_dark and direction in [d.value for d in Direction] and direction != current_room.dark_safe_exit:
+    if not _dark_direction_ok(room, direction):
         return "The room is too dark to navigate that way."
     
-    # Special handling for SOUTH at gated_hallway as NORTH at outside_door is different
-    if current_room == gated_hallway and direction == Direction.SOUTH:
-        current_room = outside_door
+    # Special handling for moves that don't follow a compass exit, such as
+    # SOUTH at gated_hallway as NORTH at outside_door is different
+    dest = SPECIAL_NAV.get((room, direction))
+    if dest is not None:
+        current_room = dest
         return current_room.get_description()
 
     # Check if trying to go to the 'gate'
     if direction == 'gate' or direction == 'metal gate':
-        if current_room == west_hallway:
-            direction = Direction.SOUTH
-        elif current_room == gated_hallway:
-            direction = Direction.NORTH
-        else:
+        direction = GATE_DIR.get(room)
+        if direction is None:
             return "There is no gate here."
 
     # Check if trying to go to a 'door'
     if direction == 'door':
-        if current_room == dark_room:
-            direction = Direction.NORTH
-        elif current_room == south_hallway:
-            direction = Direction.SOUTH
-        elif current_room == east_hallway:
-            direction = Direction.EAST
-        elif current_room == kitchen:
-            direction = Direction.NORTH
-        elif current_room == west_hallway:
-            direction = Direction.WEST
-        elif current_room == office:
-            direction = Direction.EAST
-        elif current_room == supply_closet:
-            direction = Direction.WEST
-        elif current_room == storage_room:
-            direction = Direction.SOUTH
-        elif current_room == gated_hallway:
-            current_room = outside_door
-            return current_room.get_description()
-        elif current_room == outside_door:
-            current_room = gated_hallway
-            return current_room.get_description()
-        elif current_room == outside_shed:
-            current_room = shed
-            return current_room.get_description()
-        elif current_room == shed:
-            current_room = outside_shed
-            return current_room.get_description()
-        elif current_room == mess or current_room == north_hallway:
+        if room in DOOR_DIR:
+            direction = DOOR_DIR[room]
+        elif room in TWO_DOOR_ROOMS:
             return "Which door do you mean? There are two doors here."
         else:
             return "There is no door here."
 
-    # Handling for going underground
-    if direction == 'underground' and current_room == outside_door:
-        current_room = gated_hallway
-        return current_room.get_description()
-
     # Check trying to enter the wardrobe
-    if wardrobe_found_secret in list(current_room.fixtures) and direction in ['wardrobe', 'darkness', 'opening', 'inside']:
+    if wardrobe_found_secret in room.fixtures and direction in _WARDROBE_ENTER:
         current_room = secret_room
         return current_room.get_description()
     
     # Check trying to exit the wardrobe
-    if current_room == secret_room and (direction in ['wardrobe', 'light', 'opening', 'back'] if current_room.is_dark else direction in ['wardrobe', 'opening', 'back']):
+    if room is secret_room and direction in (_WARDROBE_EXIT_DARK if room.is_dark else _WARDROBE_EXIT_LIT):
         current_room = dark_room
         return current_room.get_description()
 
     # Handle normal directional movement
-    if direction in current_room.exits():
+    next_room = room.exit_map().get(direction)
+    if next_room is not None:
         # Check if seagulls need to return
-        if current_room == beach_ne_ne and seagulls not in list(current_room.fixtures) and not game_state.DISCOVERED_SEAGULLS:
-            current_room.fixtures.add(seagulls)
+        if room is beach_ne_ne and seagulls not in room.fixtures and not game_state.DISCOVERED_SEAGULLS:
+            room.fixtures.add(seagulls)
 
         # Check if exit is locked
-        locked_exit: LockedExit|None = current_room.locked_exits.get(direction)
+        locked_exit: LockedExit|None = room.locked_exits.get(direction)
         if locked_exit and locked_exit.is_locked:
             return locked_exit.description
         
-        current_room = current_room.exit(direction)
+        current_room = next_room
         return current_room.get_description()
-    elif current_room.illegal_direction_description and direction in current_room.illegal_direction_description.keys():
-        return current_room.illegal_direction_description[direction]
+    elif room.illegal_direction_description and direction in room.illegal_direction_description.keys():
+        return room.illegal_direction_description[direction]
     else:
         return "You can't go that way."
 
 
+def _look_table(room):
+    room.items.add(unobtainable_brass_key)
+
+
+def _look_wardrobe_with_secret(room):
+    room.fixtures.remove(wardrobe_with_secret)
+    room.fixtures.add(wardrobe_found_secret)
+
+
+def _look_wardrobe_with_secret_investigated(room):
+    room.fixtures.remove(wardrobe_with_secret_investigated)
+    room.fixtures.add(wardrobe_found_secret)
+
+
+def _look_metal_table(room):
+    room.items.add(notebook)
+
+
+def _look_fridge(room):
+    room.items.add(sandwich)
+
+
+def _look_filing_cabinet(room):
+    room.fixtures.remove(filing_cabinet)
+    room.fixtures.add(filing_cabinet_taken)
+    inventory.add(band_poster)
+
+
+# What looking at a fixture changes in the room
+LOOK_TRANSITIONS = {
+    table: _look_table,
+    wardrobe_with_secret: _look_wardrobe_with_secret,
+    wardrobe_with_secret_investigated: _look_wardrobe_with_secret_investigated,
+    metal_table_1: _look_metal_table,
+    fridge: _look_fridge,
+    filing_cabinet: _look_filing_cabinet,
+}
+
+
+def _take_brass_key(room):
+    room.items.remove(unobtainable_brass_key)
+    room.fixtures.remove(table)
+    room.fixtures.add(vent)
+    return "While you were contemplating taking the key, a mouse ran up and took the key! It ran off into a vent in the corner of the room."
+
+
+def _take_cracker_boxes(room):
+    room.items.remove(cracker_boxes)
+    inventory.add(cracker_boxes)
+    room.fixtures.remove(shelf_1)
+    room.fixtures.add(shelf_2)
+    room.fixtures.add(red_button)
+    return "You take the boxes of crackers. As you remove them, you notice that there is a red button on the wall behind where the boxes of crackers were."
+
+
+def _take_notebook(room):
+    room.fixtures.remove(metal_table_1)
+    room.fixtures.add(metal_table_2)
+
+
+def _take_sandwich(room):
+    room.items.remove(sandwich)
+    inventory.add(sandwich)
+    room.fixtures.remove(fridge)
+    room.fixtures.add(fridge_no_sand)
+    return "You take the sandwich."
+
+
+# What taking an item changes in the room. A transition that returns None
+# lets the item be taken as usual.
+TAKE_TRANSITIONS = {
+    unobtainable_brass_key: _take_brass_key,
+    cracker_boxes: _take_cracker_boxes,
+    notebook: _take_notebook,
+    sandwich: _take_sandwich,
+}
+
+
 @when("investigate ITEM", context=Context.EXPLORING)
 @when("look ITEM", context=Context.EXPLORING)
 @when("look at ITEM", context=Context.EXPLORING)
+@require_light
 def look_item(item):
     global current_room
-
-    # Check trying to do things in a dark room
-    if current_room.is_dark:
-        return "The room is too dark to do anything."
+    room = current_room
     
     inv_item = inventory.find(item)
-    room_item = current_room.items.find(item)
-    fixture = current_room.fixtures.find(item)
+    room_item = room.items.find(item)
+    fixture = room.fixtures.find(item)
     if inv_item:
         set_state_flag(inv_item)
         return inv_item.description
@@ -1904,22 +2322,9 @@ def look_item(item):
         return room_item.description
     if fixture:
         set_state_flag(fixture)
-        if fixture == table:
-            current_room.items.add(unobtainable_brass_key)
-        if fixture == wardrobe_with_secret:
-            current_room.fixtures.remove(wardrobe_with_secret)
-            current_room.fixtures.add(wardrobe_found_secret)
-        if fixture == wardrobe_with_secret_investigated:
-            current_room.fixtures.remove(wardrobe_with_secret_investigated)
-            current_room.fixtures.add(wardrobe_found_secret)
-        if fixture == metal_table_1:
-            current_room.items.add(notebook)
-        if fixture == fridge:
-            current_room.items.add(sandwich)
-        if fixture == filing_cabinet:
-            current_room.fixtures.remove(filing_cabinet)
-            current_room.fixtures.add(filing_cabinet_taken)
-            inventory.add(band_poster)
+        transition = LOOK_TRANSITIONS.get(fixture)
+        if transition is not None:
+            transition(room)
 
         return fixture.description
     
@@ -1927,67 +2332,46 @@ def look_item(item):
 
 
 @when("take ITEM", context=Context.EXPLORING)
+@require_light
 def take_item(item):
     global current_room
+    room = current_room
 
-    # Check trying to do things in a dark room
-    if current_room.is_dark:
-        return "The room is too dark to do anything."
-
-    room_item = current_room.items.find(item)
-    fixture = current_room.fixtures.find(item)
+    room_item = room.items.find(item)
+    fixture = room.fixtures.find(item)
     
     if fixture:
-        if fixture == area_rug:
+        if fixture is area_rug:
             return move_rug()
         
-        if fixture == seagulls:
-            current_room.fixtures.remove(seagulls)
+        if fixture is seagulls:
+            room.fixtures.remove(seagulls)
             return "The seagulls fly away as you approach them."
         
         return f"You can't take the {item}."
     
     if room_item:
-        if room_item == unobtainable_brass_key:
-            current_room.items.remove(unobtainable_brass_key)
-            current_room.fixtures.remove(table)
-            current_room.fixtures.add(vent)
-            return "While you were contemplating taking the key, a mouse ran up and took the key! It ran off into a vent in the corner of the room."
-        
-        if room_item == cracker_boxes:
-            current_room.items.remove(cracker_boxes)
-            inventory.add(cracker_boxes)
-            current_room.fixtures.remove(shelf_1)
-            current_room.fixtures.add(shelf_2)
-            current_room.fixtures.add(red_button)
-            return "You take the boxes of crackers. As you remove them, you notice that there is a red button on the wall behind where the boxes of crackers were."
-
-        if room_item == notebook:
-            current_room.fixtures.remove(metal_table_1)
-            current_room.fixtures.add(metal_table_2)
-        
-        if room_item == sandwich:
-            current_room.items.remove(sandwich)
-            inventory.add(sandwich)
-            current_room.fixtures.remove(fridge)
-            current_room.fixtures.add(fridge_no_sand)
-            return "You take the sandwich."
-        
-        if current_room == central_hallway:
+        transition = TAKE_TRANSITIONS.get(room_item)
+        if transition is not None:
+            result = transition(room)
+            if result is not None:
+                return result
+
+        if room is central_hallway:
             if not game_state.CAT_HIDDEN and not game_state.CAT_OBTAINED:
                 return "When you try to take the cat, it runs away."
-            if room_item == open_can:
+            if room_item is open_can:
                 return "The cat is currently eating from the can. You can't take it right now."
         
-        if current_room == central_hallway and room_item == cat:
-            taken_cat = current_room.items.take(item)
-            taken_can = current_room.items.take("open can")
+        if room is central_hallway and room_item is cat:
+            taken_cat = room.items.take(item)
+            taken_can = room.items.take("open can")
             inventory.add(taken_cat)
             inventory.add(taken_can)
 
             return "You take the cat. You also take the open can of food it was eating from. The cat seems happy to be with you and curls up in your arms, purring contentedly."
 
-        taken_item = current_room.items.take(item)
+        taken_item = room.items.take(item)
         inventory.add(taken_item)
         return f'You take {taken_item.def_name}.'
 
@@ -1995,24 +2379,19 @@ def take_item(item):
 
 
 @when("eat ITEM", context=Context.EXPLORING)
+@require_light
 def eat_item(item):
-    global current_room
-
-    # Check trying to do things in a dark room
-    if current_room.is_dark:
-        return "The room is too dark to do anything."
-    
     inv_item = inventory.find(item)
 
     if inv_item:
-        if inv_item == sandwich:
+        if inv_item is sandwich:
             inventory.remove(sandwich)
             return "You rip into the sandwich eagerly. Each bite is a perfect combination of flavors and textures—savory meat, tangy cheese, fresh vegetables. Before you know it, you've finished every last crumb. You feel refreshed and energized."
-        if inv_item == cracker_boxes:
+        if inv_item is cracker_boxes:
             return "You open the boxes of crackers. You munch on a few of the crackers and find them tasty, though a bit stale."
-        if inv_item == open_can:
+        if inv_item is open_can:
             return "You don't really want to eat mushy food. It's not very appetizing."
-        if inv_item == dry_rations:
+        if inv_item is dry_rations:
             inventory.remove(dry_rations)
             return "You eat the dry rations. They are very stale, and you don't feel very satisfied."
         
@@ -2028,7 +2407,7 @@ def unlock_door():
     if not obj:
         return f"You do not have a key."
     
-    if current_room == west_hallway:
+    if current_room is west_hallway:
         inventory.remove(obj)
         heavy_wooden_door.is_locked = False
         return "You unlock the heavy-looking wooden door."
@@ -2036,19 +2415,116 @@ def unlock_door():
     return "There is nowhere to use your key."
 
 
+def _activate_breaker():
+    """Flip the open breaker in the current room on and light the dark rooms."""
+    current_room.fixtures.remove(breaker_open)
+    current_room.fixtures.add(breaker_open_and_on)
+    dark_room.is_dark = False
+    mess.is_dark = False
+    return "You flip the breaker to the 'on' position."
+
+
+def _feed_cat():
+    """Put the open can down in the current room and let the cat find it."""
+    game_state.CAT_HIDDEN = False
+    game_state.CAT_OBTAINED = True
+    current_room.items.add(cat)
+    current_room.items.add(open_can)
+    inventory.remove(open_can)
+    return "You put the open can on the ground. A fluffy gray cat comes running over and starts happily eating the food. It looks up at you with big green eyes, and then goes back to eating."
+
+
+def _use_crowbar_on_breaker():
+    current_room.fixtures.remove(breaker_closed)
+    current_room.fixtures.add(breaker_open)
+    return "You pry open the metal panel with the crowbar. Inside you see a circuit breaker. It looks like all of the circuit breakers are in the 'on' position except for one."
+
+
+def _use_crowbar_on_crates():
+    room = current_room
+    room.fixtures.remove(crates)
+    room.fixtures.add(open_crates)
+    room.items.add(stuffie)
+    room.items.add(dry_rations)
+    room.items.add(batteries)
+    return "You pry open some wooden crates with the crowbar. Inside you find a cute stuffie, dry rations, and a few batteries. You are feeling tired and don't want to open any more crates right now."
+
+
+def _use_cat_on_vent():
+    inventory.add(unobtainable_brass_key)
+    current_room.fixtures.remove(vent)
+    current_room.fixtures.add(vent_empty)
+    return "The cat dashes into the vent! You hear a commotion inside. After a moment, the cat comes back out, proudly carrying a small brass key in its mouth. It drops the key at your feet. You retrieve the key, and your friendly feline companion."
+
+
+def _use_crackers_on_seagulls():
+    game_state.DISCOVERED_SEAGULLS = True
+    ADDITIONAL_STATE_TO_RESPOND[SEAGULLS_FOUND] = "True"
+    current_room.fixtures.remove(seagulls)
+    return "You take a handfull of crackers and toss them lightly towards the birds. They quickly scurry over to the crackers and begin devouring them, screeching \"MINE!\". Contented, most of them fly away - all except for one. It cranes its neck sideways before saying \"Thank you\" in a deep baritone voice. It flies away into the distance..."
+
+
+def _use_stuffie_on_notebook():
+    inventory.remove(notebook)
+    inventory.remove(notebook_glowing)
+    return "What does that even mean? You touch the stuffie to the notebook... You're not sure what to expect by doing that, but the notebook starts to glow?"
+
+
+def _use_batteries_on_flashlight():
+    inventory.remove(flashlight_dead)
+    inventory.remove(batteries)
+    inventory.add(flashlight_powered)
+    return "You insert the batteries into the flashlight. It feels a bit heavier now, but you can tell it is ready to use."
+
+
+def _reply(text):
+    """Return a handler that just answers with text."""
+    return lambda: text
+
+
+# What happens when using an inventory item on a fixture (or another item)
+USE_PAIR_TABLE = {
+    (crowbar, breaker_closed): _use_crowbar_on_breaker,
+    (crowbar, breaker_open): _reply("The panel is already open."),
+    (crowbar, breaker_open_and_on): _reply("The panel is already open."),
+    (crowbar, crates): _use_crowbar_on_crates,
+    (crowbar, open_crates): _reply("You are feeling tired and don't want to open any more crates right now."),
+    (crowbar, vent): _reply("You could probably use the crowbar to pry off the vent cover. You don't think you'd be able to fit into it even without the vent cover. It's probably best to leave it alone."),
+    (crowbar, vent_empty): _reply("You could probably use the crowbar to pry off the vent cover. You don't think you'd be able to fit into it even without the vent cover. It's probably best to leave it alone."),
+    (cat, vent): _use_cat_on_vent,
+    (cat, vent_empty): _reply("The cat doesn't seem to want to go back into the vent."),
+    (cracker_boxes, cat): _reply("The cat doesn't seem interested in crackers."),
+    (cracker_boxes, seagulls): _use_crackers_on_seagulls,
+    (dry_rations, cat): _reply("The cat doesn't seem interested in the dry rations."),
+    (dry_rations, vent): _reply("The mouse doesn't seem interested in the dry rations."),
+    (dry_rations, seagulls): _reply("They stare blankly at you. They don't seem impressed by your offering."),
+    (stuffie, notebook): _use_stuffie_on_notebook,
+    (stuffie, notebook_glowing): _reply("You touch the stuffie to the notebook expecting something to happen... The notebook continues steadily glowing."),
+    (batteries, flashlight_dead): _use_batteries_on_flashlight,
+    (open_can, cat): _reply("You feed the fluffy gray cat some food. It looks very content."),
+}
+
+# Replies for items that have no effect on anything outside USE_PAIR_TABLE
+USE_ITEM_FALLBACK = {
+    crowbar: "You can't use the crowbar on that.",
+    key: "There is nowhere to use your key.",
+}
+
+
 @when("use ITEM on FIXTURE", context=Context.EXPLORING)
 def use_item_on_fixture(item, fixture):
     global current_room
+    room = current_room
 
     inv_item = inventory.find(item)
-    obj_item = current_room.fixtures.find(fixture) or inventory.find(fixture)
-
     if not inv_item:
         return f"You do not have {item}."
 
+    obj_item = room.fixtures.find(fixture) or inventory.find(fixture)
+
     if not obj_item:
-        if inv_item == key:
-            if current_room == west_hallway and (fixture.strip() == 'door' or fixture.strip() == 'heavy door' or fixture.strip() == 'wooden door' or fixture.strip() == 'heavy wooden door'):
+        if inv_item is key:
+            if room is west_hallway and fixture in _HEAVY_DOOR_NAMES:
                 inventory.remove(key)
                 heavy_wooden_door.is_locked = False
                 return "You unlock the heavy-looking wooden door."
@@ -2056,84 +2532,17 @@ def use_item_on_fixture(item, fixture):
             return "There is nowhere to use your key."
 
         # Special case to feed the cat
-        if inv_item == open_can and current_room == central_hallway and (fixture.strip() == 'cat' or fixture.strip() == 'shadow'):
-            game_state.CAT_HIDDEN = False
-            game_state.CAT_OBTAINED = True
-            current_room.items.add(cat)
-            current_room.items.add(open_can)
-            inventory.remove(open_can)
-            return "You put the open can on the ground. A fluffy gray cat comes running over and starts happily eating the food. It looks up at you with big green eyes, and then goes back to eating."
+        if inv_item is open_can and room is central_hallway and fixture in _HIDDEN_CAT_NAMES:
+            return _feed_cat()
 
         return f"There is no {fixture} here."
 
-    if inv_item == crowbar:
-        if obj_item == breaker_closed:
-            current_room.fixtures.remove(breaker_closed)
-            current_room.fixtures.add(breaker_open)
-            return "You pry open the metal panel with the crowbar. Inside you see a circuit breaker. It looks like all of the circuit breakers are in the 'on' position except for one."
-        if obj_item == breaker_open or obj_item == breaker_open_and_on:
-            return "The panel is already open."
-        if obj_item == crates:
-            current_room.fixtures.remove(crates)
-            current_room.fixtures.add(open_crates)
-            current_room.items.add(stuffie)
-            current_room.items.add(dry_rations)
-            current_room.items.add(batteries)
-            return "You pry open some wooden crates with the crowbar. Inside you find a cute stuffie, dry rations, and a few batteries. You are feeling tired and don't want to open any more crates right now."
-        if obj_item == open_crates:
-            return "You are feeling tired and don't want to open any more crates right now."
-        if obj_item == vent or obj_item == vent_empty:
-            return "You could probably use the crowbar to pry off the vent cover. You don't think you'd be able to fit into it even without the vent cover. It's probably best to leave it alone."
-        else:
-            return "You can't use the crowbar on that."
-        
-    if inv_item == cat:
-        if obj_item == vent:
-            inventory.add(unobtainable_brass_key)
-            current_room.fixtures.remove(vent)
-            current_room.fixtures.add(vent_empty)
-            return "The cat dashes into the vent! You hear a commotion inside. After a moment, the cat comes back out, proudly carrying a small brass key in its mouth. It drops the key at your feet. You retrieve the key, and your friendly feline companion."
-        if obj_item == vent_empty:
-            return "The cat doesn't seem to want to go back into the vent."
-        
-    if inv_item == cracker_boxes:
-        if obj_item == cat:
-            return "The cat doesn't seem interested in crackers."
-        if obj_item == seagulls:
-            game_state.DISCOVERED_SEAGULLS = True
-            ADDITIONAL_STATE_TO_RESPOND[ADDITIONAL_STATE_KEYS.SEAGULLS_FOUND] = "True"
-            current_room.fixtures.remove(seagulls)
-            return "You take a handfull of crackers and toss them lightly towards the birds. They quickly scurry over to the crackers and begin devouring them, screeching \"MINE!\". Contented, most of them fly away - all except for one. It cranes its neck sideways before saying \"Thank you\" in a deep baritone voice. It flies away into the distance..."
-
-    if inv_item == dry_rations:
-        if obj_item == cat:
-            return "The cat doesn't seem interested in the dry rations."
-        if obj_item == vent:
-            return "The mouse doesn't seem interested in the dry rations."
-        if obj_item == seagulls:
-            return "They stare blankly at you. They don't seem impressed by your offering."
-
-    if inv_item == stuffie:
-        if obj_item == notebook:
-            inventory.remove(notebook)
-            inventory.remove(notebook_glowing)
-            return "What does that even mean? You touch the stuffie to the notebook... You're not sure what to expect by doing that, but the notebook starts to glow?"
-        if obj_item == notebook_glowing:
-            return "You touch the stuffie to the notebook expecting something to happen... The notebook continues steadily glowing."
-
-    if inv_item == batteries and obj_item == flashlight_dead:
-        inventory.remove(flashlight_dead)
-        inventory.remove(batteries)
-        inventory.add(flashlight_powered)
-        return "You insert the batteries into the flashlight. It feels a bit heavier now, but you can tell it is ready to use."
-
-    if inv_item == key:
-        return "There is nowhere to use your key."
-
-    # Special case to feed the cat
-    if inv_item == open_can:
-        if obj_item == cat:
-            return "You feed the fluffy gray cat some food. It looks very content."
+    handler = USE_PAIR_TABLE.get((inv_item, obj_item))
+    if handler is not None:
+        return handler()
+
+    if inv_item in USE_ITEM_FALLBACK:
+        return USE_ITEM_FALLBACK[inv_item]
 
     return f"You can't use {item} on {fixture}."
         
@@ -2142,97 +2551,82 @@ def use_item_on_fixture(item, fixture):
 @when("turn on breaker", context=Context.EXPLORING)
 def turn_on_breaker():
     global current_room
+    room = current_room
 
-    if current_room != supply_closet or (current_room == supply_closet and breaker_closed in list(current_room.fixtures)):
+    if room is not supply_closet or (room is supply_closet and breaker_closed in room.fixtures):
         return "There is nothing to turn on here."
     else:
-        if breaker_open in list(current_room.fixtures):
-            current_room.fixtures.remove(breaker_open)
-            current_room.fixtures.add(breaker_open_and_on)
-            dark_room.is_dark = False
-            mess.is_dark = False
-            return "You flip the breaker to the 'on' position."
-        if breaker_open_and_on in list(current_room.fixtures):
+        if breaker_open in room.fixtures:
+            return _activate_breaker()
+        if breaker_open_and_on in room.fixtures:
             return "The breaker is already in the 'on' position."
 
 
 @when("use ITEM", context=Context.EXPLORING)
 def use_item(item):
     global current_room
+    room = current_room
 
     inv_item = inventory.find(item)
-    fixture = current_room.fixtures.find(item)
+    fixture = room.fixtures.find(item)
 
     if item == 'switch':
-        current_room.fixtures.remove(breaker_open)
-        current_room.fixtures.add(breaker_open_and_on)
-        dark_room.is_dark = False
-        mess.is_dark = False
-        return "You flip the breaker to the 'on' position."
+        return _activate_breaker()
 
     if fixture:
-        if fixture == phone:
+        if fixture is phone:
             if early_access_mode:
                 set_context(Context.USING_PHONE)
                 return "You pick up the phone. It feels heavy and old. You hear a dial tone... What number do you want to call?"
             else:
-                ADDITIONAL_STATE_TO_RESPOND[ADDITIONAL_STATE_KEYS.CALL_WITH_HINT] = 'arbitrary'
-                ADDITIONAL_STATE_TO_RESPOND[ADDITIONAL_STATE_KEYS.HINT_INDEX] = 'arbitrary'
+                ADDITIONAL_STATE_TO_RESPOND[CALL_WITH_HINT] = 'arbitrary'
+                ADDITIONAL_STATE_TO_RESPOND[HINT_INDEX] = 'arbitrary'
                 return "You pick up the phone. It feels heavy and old. You hear a dial tone... You feel sentimental and call home."
-        if fixture == breaker_open:
-            current_room.fixtures.remove(breaker_open)
-            current_room.fixtures.add(breaker_open_and_on)
-            dark_room.is_dark = False
-            mess.is_dark = False
-            return "You flip the breaker to the 'on' position."
-        if fixture == safe:
+        if fixture is breaker_open:
+            return _activate_breaker()
+        if fixture is safe:
             set_context(Context.USING_SAFE)
             return "You push one of the buttons on the keypad and it lights up. It seems to want you to enter five digits... What do you want to enter?"
-        if fixture == safe_open:
+        if fixture is safe_open:
             return "You've already opened the safe."
-        if fixture == computer:
-            current_room.fixtures.remove(computer)
-            current_room.fixtures.add(computer_on)
-            game_state.OFFICE_COMPUTER = True
+        if fixture is computer:
+            room.fixtures.remove(computer)
+            room.fixtures.add(computer_on)
+            game_state.OFFICE_FOUND |= OFFICE_COMPUTER
             check_if_all_office_collected()
             return "You turn on the power and the whole thing hums with old cooling fans. The screen comes to life and you are at the log in screen. The wallpaper for the login screen is very interesting. It depicts scores of pigeons escaping from a cage. There are three pigeons still in the cage, with five perched nearby, and eight flying off into the distance..."
-        if fixture == red_button:
+        if fixture is red_button:
             return push_button()
 
     if not inv_item:
         return f"You do not have {item}."
 
-    if inv_item == flashlight_powered:
-        if current_room == central_hallway:
+    if inv_item is flashlight_powered:
+        if room is central_hallway:
             game_state.CAT_HIDDEN = False
             return "You shine the flashlight around." + (
-                " In the shadows you see big reflective green eyes staring at you. It looks like a cat!" if cat not in list(central_hallway.items) else "")
+                " In the shadows you see big reflective green eyes staring at you. It looks like a cat!" if cat not in central_hallway.items else "")
         
-        if current_room == secret_room:
-            current_room.is_dark = False
-            return current_room.get_description()
+        if room is secret_room:
+            room.is_dark = False
+            return room.get_description()
         
         return "It's already light enough here to see without a flashlight."
 
-    if inv_item == flashlight_dead:
+    if inv_item is flashlight_dead:
         return "you try to use the flashlight, but it appears to be dead."
 
-    if inv_item == open_can:
-        if current_room == central_hallway:
-            game_state.CAT_HIDDEN = False
-            game_state.CAT_OBTAINED = True
-            current_room.items.add(cat)
-            current_room.items.add(open_can)
-            inventory.remove(open_can)
-            return "You put the open can on the ground. A fluffy gray cat comes running over and starts happily eating the food. It looks up at you with big green eyes, and then goes back to eating."
+    if inv_item is open_can:
+        if room is central_hallway:
+            return _feed_cat()
         
-    if inv_item == closed_can:
+    if inv_item is closed_can:
         return "The can isn't open..."
         
-    if inv_item == stuffie:
+    if inv_item is stuffie:
         return "You hug the stuffie. It feels comforting and makes a soft squeak."
     
-    if inv_item == cat:
+    if inv_item is cat:
         return "You hug the cat. It purrs softly and nuzzles against you."
     
     return f"You can't use {item}."
@@ -2245,15 +2639,15 @@ def open_item(item):
     inv_item = inventory.find(item)
     fixture = current_room.fixtures.find(item)
 
-    if inv_item == closed_can:
+    if inv_item is closed_can:
         inventory.remove(closed_can)
         inventory.add(open_can)
         return "You pull the tab on the top of the can and open it. It has a brown mushy substance inside."
 
-    if fixture == breaker_closed:
+    if fixture is breaker_closed:
         return "You try to open the metal panel, but it's firmly shut."
 
-    if fixture == breaker_open or fixture == breaker_open_and_on:
+    if fixture is breaker_open or fixture is breaker_open_and_on:
         return "The panel is already open."
     
     return f"You can't open {item}."
@@ -2263,8 +2657,7 @@ def open_item(item):
 def show_inventory():
     if not inventory:
         return "You have nothing"
-    for item in inventory:
-        return "You have: \n" + '\n'.join(f'* {item.name}' for item in inventory)
+    return "You have: \n" + '\n'.join([item._bullet for item in inventory])
 
 
 @when("explain", context=Context.EXPLORING)
@@ -2273,11 +2666,11 @@ def help_cmd():
 
 
 def controller_wardrobe():
-    if wardrobe in list(dark_room.fixtures):
+    if wardrobe in dark_room.fixtures:
         dark_room.fixtures.remove(wardrobe)
         dark_room.fixtures.add(wardrobe_with_secret)
     
-    if wardrobe_investigated in list(dark_room.fixtures):
+    if wardrobe_investigated in dark_room.fixtures:
         dark_room.fixtures.remove(wardrobe_investigated)
         dark_room.fixtures.add(wardrobe_with_secret_investigated)
 
@@ -2310,12 +2703,12 @@ if debug_mode:
     @when("seagulls test") # DEBUG COMMAND -
     def seagulls_test():
         game_state.DISCOVERED_SEAGULLS = True
-        ADDITIONAL_STATE_TO_RESPOND[ADDITIONAL_STATE_KEYS.SEAGULLS_FOUND] = "True"
+        ADDITIONAL_STATE_TO_RESPOND[SEAGULLS_FOUND] = "True"
         return "You take a handfull of crackers and toss them lightly towards the birds."
         
 
 def fake_sms_reply(sender, body):
-    global ADDITIONAL_STATE_TO_RESPOND, current_room, inventory, game_state
+    global current_room, inventory, game_state
     
     try:
         result = dispatch_command(body)
@@ -2325,13 +2718,15 @@ def fake_sms_reply(sender, body):
     if not result:
         result = RESPONSE_UNKNOWN
 
-    response = {
-        "body": result,
-        **(ADDITIONAL_STATE_TO_RESPOND if ADDITIONAL_STATE_TO_RESPOND else {})
-    }
+    # Most replies carry no additional state
+    if not ADDITIONAL_STATE_TO_RESPOND:
+        return '{"body": %s}' % json.dumps(result)
+
+    response = {"body": result}
+    response.update(ADDITIONAL_STATE_TO_RESPOND)
 
     # Clear additional state
-    ADDITIONAL_STATE_TO_RESPOND = {}
+    ADDITIONAL_STATE_TO_RESPOND.clear()
 
     return json.dumps(response)
 